@@ -1,83 +1,400 @@
 #!/usr/bin/env python3
 import requests
+from requests.adapters import HTTPAdapter
+import functools
+import hashlib
+import os
 import time
 import json
+import logging
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+REPORT_FILE = "network_resilience_test_report.json"
+RESULTS_FILE = "network_resilience_test_report.ndjson"
+
+# Top-level fields each endpoint's response must contain
+HEALTH_REQUIRED = frozenset({"status", "timestamp", "services", "features", "performance"})
+METRICS_REQUIRED = frozenset({"timestamp", "system", "services", "cache", "network", "summary"})
+AGENT_REQUIRED = frozenset({"status", "message", "services", "features", "timestamp"})
+
+# How much of a non-JSON response body (e.g. an HTML error page) to keep
+NON_JSON_PREVIEW_BYTES = 1024
+
+# Client errors that will never succeed on retry
+_NON_RETRIABLE = frozenset({400, 401, 403, 404, 405, 409, 410, 415, 422})
+
+
+def _loads(content):
+    """Parse a raw JSON response body, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _dumps_line(record):
+    """Serialize a single report record as one compact JSON line"""
+    if orjson is not None:
+        return orjson.dumps(record).decode()
+    return json.dumps(record, separators=(",", ":"))
+
+
+class ResponseCache:
+    """Disk-backed record/replay cache for idempotent API responses
+
+    Inactive unless REPLAY=1 is set: stored responses are then served instead of hitting the
+    network, and misses are recorded for the next run. Normal runs never touch the disk.
+    Callers only use it for requests whose answer does not depend on state changed earlier
+    in the run.
+    """
+    # POST actions that only read state and are therefore safe to replay
+    CACHEABLE_POST_ACTIONS = frozenset({"getBalance", "analyzePerformance"})
+
+    def __init__(self, cache_dir=os.path.join(".cache", "responses"), replay=None):
+        self.cache_dir = cache_dir
+        self.replay = os.getenv("REPLAY") == "1" if replay is None else replay
+
+    def _key(self, method, url, data):
+        body = json.dumps(data, sort_keys=True) if data else ''
+        return hashlib.sha256(f"{method}|{url}|{body}".encode()).hexdigest()
+
+    def _path(self, method, url, data):
+        return os.path.join(self.cache_dir, f"{self._key(method, url, data)}.json")
+
+    def is_cacheable(self, method, data):
+        if method == 'GET':
+            return True
+        return method == 'POST' and isinstance(data, dict) and data.get("action") in self.CACHEABLE_POST_ACTIONS
+
+    def get(self, method, url, data=None):
+        """Return a cached (status_code, response_data, body_bytes) tuple, or None on a miss"""
+        if not self.replay or not self.is_cacheable(method, data):
+            return None
+        try:
+            with open(self._path(method, url, data)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry["status"], entry["body"], entry.get("bytes")
+
+    def put(self, method, url, data, status_code, response_data, body_bytes=None):
+        """Record a response on disk so later replay runs can serve it"""
+        if not self.replay or not self.is_cacheable(method, data):
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._path(method, url, data), "w") as f:
+                json.dump({"status": status_code, "body": response_data, "bytes": body_bytes}, f)
+        except (OSError, TypeError) as e:
+            logger.warning(f"⚠️ Could not cache response for {method} {url}: {str(e)}")
+
 class EchoFiNetworkResilienceTest:
-    def __init__(self, base_url="http://localhost:3000"):
+    def __init__(self, base_url="http://localhost:3000", verbose=None):
         self.base_url = base_url
+        # Full response bodies are only retained in the report when ECHOFI_VERBOSE=1
+        self.verbose = os.getenv("ECHOFI_VERBOSE") == "1" if verbose is None else verbose
+        self._api_base = f"{base_url}/api/"
         self.tests_run = 0
         self.tests_passed = 0
-        self.test_results = []
+        self._lock = threading.Lock()
+        # Results are streamed to disk one record at a time instead of kept in memory;
+        # run_all_tests owns the file handle for the duration of a run
+        self._report_lock = threading.Lock()
+        self._report_fp = None
+        self.response_cache = ResponseCache()
+        # Replay is limited to the independent read-only phase; stateful tests always hit the server
+        self._replay_phase = False
+        self._memo = {}
+        # Per-thread output buffer so parallel tests each log as one uninterrupted block
+        self._log_local = threading.local()
 
-    def run_test(self, name, method, endpoint, expected_status, data=None, headers=None, retry_count=1, retry_delay=2):
-        """Run a single API test with retry logic"""
-        url = f"{self.base_url}/api/{endpoint}"
-        default_headers = {'Content-Type': 'application/json'}
-        if headers:
-            default_headers.update(headers)
-        
-        self.tests_run += 1
-        print(f"\n🔍 Testing {name}...")
+    @functools.cached_property
+    def session(self):
+        """Shared HTTP session, built on first use so idle instances never pay for it"""
+        # Share pooled, keep-alive connections to the single target host across the whole run;
+        # pool_maxsize covers the widest parallel phase so no socket is discarded and re-opened
+        session = requests.Session()
+        session.headers["Connection"] = "keep-alive"
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8, max_retries=0, pool_block=False)
+        session.mount("http://", adapter)
+        if self.base_url.startswith("https://"):
+            session.mount("https://", adapter)
+        return session
+
+    @functools.cached_property
+    def _default_headers(self):
+        return {'Content-Type': 'application/json'}
+
+    # POST actions whose responses can be reused within a single run
+    MEMOIZABLE_POST_ACTIONS = frozenset({"getBalance"})
+
+    def _memo_key(self, method, endpoint, data, headers=None):
+        if method == 'GET' or (isinstance(data, dict) and data.get("action") in self.MEMOIZABLE_POST_ACTIONS):
+            return (method, endpoint, json.dumps(data, sort_keys=True), json.dumps(headers, sort_keys=True))
+        return None
+
+    def _log(self, message):
+        """Log a line, holding it in the current test's buffer when one is active"""
+        buffer = getattr(self._log_local, "buffer", None)
+        if buffer is not None:
+            buffer.append(message)
+        else:
+            logger.info(message)
+
+    def _run_buffered(self, test):
+        """Run a test with its output collected and emitted as a single log record when it finishes"""
+        self._log_local.buffer = []
+        try:
+            return test()
+        finally:
+            lines = self._log_local.buffer
+            self._log_local.buffer = None
+            if lines:
+                logger.info("\n".join(lines))
+
+    def _response_fields(self, response_data, body_bytes=None):
+        """Report fields describing a response: the full body when verbose, otherwise only its size
+
+        response_bytes is the raw HTTP body length in bytes, or null when it is unknown
+        (e.g. for actions answered inside a /api/batch response).
+        """
+        if self.verbose:
+            return {"response": response_data}
+        return {"response": None, "response_bytes": body_bytes}
+
+    def _record(self, result):
+        """Append a single test result to the streamed results file"""
+        line = _dumps_line(result) + "\n"
+        with self._report_lock:
+            if self._report_fp is not None:
+                self._report_fp.write(line)
+            else:
+                # Tests invoked outside run_all_tests append to the previous run's results
+                with open(RESULTS_FILE, "a", encoding="utf-8") as f:
+                    f.write(line)
+
+    def clear_memo(self):
+        """Forget memoized responses so the next requests observe fresh server state"""
+        with self._lock:
+            self._memo.clear()
+
+    def run_test(self, name, method, endpoint, expected_status, data=None, headers=None, retry_count=1, retry_delay=2, memoize=True):
+        """Run a single API test with retry logic and exponential backoff
+
+        Successful GETs and read-only agent actions are memoized for the rest of the run;
+        pass memoize=False to force a fresh request. The disk replay cache is only consulted
+        during run_all_tests' independent read-only phase.
+        """
+        url = self._api_base + endpoint
+        headers = {**self._default_headers, **headers} if headers else self._default_headers
+        
+        with self._lock:
+            self.tests_run += 1
+        self._log(f"\n🔍 Testing {name}...")
+        
+        # Fresh requests bypass the on-disk replay cache as well as the memo
+        use_cache = self._replay_phase and memoize
+        
+        memo_key = self._memo_key(method, endpoint, data, headers)
+        if memo_key is None:
+            # Anything that may mutate server state invalidates earlier responses
+            self.clear_memo()
+        elif memoize:
+            with self._lock:
+                memoized = self._memo.get(memo_key)
+                # A memoized response only answers a test expecting the same status; otherwise ask the server
+                if memoized is not None and memoized[0] != expected_status:
+                    memoized = None
+                if memoized is not None:
+                    status_code, response_data, body_bytes = memoized
+                    self.tests_passed += 1
+                    self._record({
+                        "name": name,
+                        "success": True,
+                        "status_code": status_code,
+                        **self._response_fields(response_data, body_bytes),
+                        "memoized": True
+                    })
+            if memoized is not None:
+                self._log(f"✅ Passed - {name} - Status: {status_code} (memoized)")
+                return True, response_data
         
         for attempt in range(retry_count):
             try:
-                if method == 'GET':
-                    response = requests.get(url, headers=default_headers, timeout=10)
-                elif method == 'POST':
-                    response = requests.post(url, json=data, headers=default_headers, timeout=10)
-                
-                success = response.status_code == expected_status
+                # Retries always go to the network rather than replaying the response that just failed
+                cached = self.response_cache.get(method, url, data) if use_cache and attempt == 0 else None
+                if cached is not None:
+                    status_code, response_data, body_bytes = cached
+                    self._log("♻️ Replaying cached response")
+                else:
+                    if method == 'GET':
+                        response = self.session.get(url, headers=headers, timeout=10)
+                    elif method == 'POST':
+                        response = self.session.post(url, json=data, headers=headers, timeout=10)
+                    status_code = response.status_code
+                    body_bytes = len(response.content)
+                    
+                    # Try to parse response as JSON; keep only a short preview of anything else
+                    try:
+                        response_data = _loads(response.content)
+                    except ValueError:  # JSONDecodeError, or a body that is not valid UTF-8
+                        response_data = {
+                            "__non_json__": True,
+                            "content_type": response.headers.get("Content-Type", ""),
+                            "body_preview": response.content[:NON_JSON_PREVIEW_BYTES].decode("utf-8", "replace")
+                        }
+                    
+                    # Only record the expected outcome so a transient failure is never replayed
+                    if use_cache and status_code == expected_status:
+                        self.response_cache.put(method, url, data, status_code, response_data, body_bytes)
                 
-                # Try to parse response as JSON
-                response_data = None
-                try:
-                    response_data = response.json()
-                except:
-                    response_data = response.text
+                success = status_code == expected_status
                 
                 if success:
-                    self.tests_passed += 1
-                    print(f"✅ Passed - Status: {response.status_code}")
-                    self.test_results.append({
-                        "name": name,
-                        "success": True,
-                        "status_code": response.status_code,
-                        "response": response_data
-                    })
+                    self._log(f"✅ Passed - {name} - Status: {status_code}")
+                    with self._lock:
+                        if memo_key is not None:
+                            self._memo[memo_key] = (status_code, response_data, body_bytes)
+                        self.tests_passed += 1
+                        self._record({
+                            "name": name,
+                            "success": True,
+                            "status_code": status_code,
+                            **self._response_fields(response_data, body_bytes)
+                        })
                     return True, response_data
                 else:
-                    print(f"❌ Failed - Expected {expected_status}, got {response.status_code}")
-                    if attempt < retry_count - 1:
-                        print(f"Retrying in {retry_delay} seconds... (Attempt {attempt+1}/{retry_count})")
-                        time.sleep(retry_delay)
+                    self._log(f"❌ Failed - {name} - Expected {expected_status}, got {status_code}")
+                    if attempt < retry_count - 1 and status_code not in _NON_RETRIABLE:
+                        delay = retry_delay * (2 ** attempt)
+                        self._log(f"Retrying {name} in {delay} seconds... (Attempt {attempt+1}/{retry_count})")
+                        time.sleep(delay)
                     else:
-                        self.test_results.append({
-                            "name": name,
-                            "success": False,
-                            "status_code": response.status_code,
-                            "response": response_data,
-                            "error": f"Expected status {expected_status}, got {response.status_code}"
-                        })
+                        with self._lock:
+                            self._record({
+                                "name": name,
+                                "success": False,
+                                "status_code": status_code,
+                                **self._response_fields(response_data, body_bytes),
+                                "error": f"Expected status {expected_status}, got {status_code}"
+                            })
                         return False, response_data
             
             except Exception as e:
-                print(f"❌ Failed - Error: {str(e)}")
+                self._log(f"❌ Failed - {name} - Error: {str(e)}")
                 if attempt < retry_count - 1:
-                    print(f"Retrying in {retry_delay} seconds... (Attempt {attempt+1}/{retry_count})")
-                    time.sleep(retry_delay)
+                    delay = retry_delay * (2 ** attempt)
+                    self._log(f"Retrying {name} in {delay} seconds... (Attempt {attempt+1}/{retry_count})")
+                    time.sleep(delay)
                 else:
-                    self.test_results.append({
-                        "name": name,
-                        "success": False,
-                        "error": str(e)
-                    })
+                    with self._lock:
+                        self._record({
+                            "name": name,
+                            "success": False,
+                            "error": str(e)
+                        })
                     return False, None
         
         return False, None
 
+    def run_batch(self, name, actions, timeout=30):
+        """Run several API tests in one round-trip via /api/batch, falling back to individual requests
+
+        Each action is a (name, method, endpoint, expected_status, data) tuple; returns a list of
+        (success, response_data) pairs in the same order as run_test would.
+        """
+        self._log(f"\n📦 Batching {name} ({len(actions)} actions)...")
+        if any(self._memo_key(method, endpoint, data) is None for _, method, endpoint, _, data in actions):
+            self.clear_memo()
+        payload = {
+            "batch": [
+                {"endpoint": endpoint, "method": method, "data": data}
+                for _, method, endpoint, _, data in actions
+            ]
+        }
+        
+        try:
+            response = self.session.post(
+                self._api_base + "batch",
+                json=payload,
+                headers=self._default_headers,
+                timeout=timeout
+            )
+        except Exception as e:
+            self._log(f"❌ Batch request failed - Error: {str(e)}")
+            response = None
+        
+        if response is None or response.status_code in (404, 405):
+            self._log("Batch endpoint unavailable, falling back to individual requests")
+            return [
+                self.run_test(action_name, method, endpoint, expected_status, data=data)
+                for action_name, method, endpoint, expected_status, data in actions
+            ]
+        
+        try:
+            batch_body = _loads(response.content)
+        except ValueError:
+            batch_body = None
+        
+        # A batch-level failure (e.g. too many actions, or a server error) fails every action with the real cause
+        batch_error = None
+        if not response.ok:
+            server_error = batch_body.get("error") if isinstance(batch_body, dict) else None
+            batch_error = f"Batch request failed with status {response.status_code}: {server_error or 'no error message'}"
+        elif not isinstance(batch_body, dict) or not isinstance(batch_body.get("results"), list):
+            batch_error = f"Malformed batch response (status {response.status_code})"
+        
+        if batch_error:
+            self._log(f"❌ {batch_error}")
+            results = []
+        else:
+            results = batch_body["results"]
+        
+        outcomes = []
+        for i, (action_name, _, _, expected_status, _) in enumerate(actions):
+            result = results[i] if i < len(results) else {}
+            status_code = result.get("status")
+            response_data = result.get("body")
+            success = status_code == expected_status
+            if batch_error:
+                error = batch_error
+            elif i >= len(results):
+                error = "Missing from batch response"
+            else:
+                error = f"Expected status {expected_status}, got {status_code}"
+            
+            self._log(f"🔍 {action_name}: {'✅ Passed' if success else '❌ Failed'} - Status: {status_code}")
+            with self._lock:
+                self.tests_run += 1
+                if success:
+                    self.tests_passed += 1
+                    self._record({
+                        "name": action_name,
+                        "success": True,
+                        "status_code": status_code,
+                        **self._response_fields(response_data)
+                    })
+                else:
+                    self._record({
+                        "name": action_name,
+                        "success": False,
+                        "status_code": status_code,
+                        **self._response_fields(response_data),
+                        "error": error
+                    })
+            outcomes.append((success, response_data))
+        
+        return outcomes
+
     def test_health_endpoint(self):
         """Test the health check endpoint"""
         success, response = self.run_test(
@@ -88,15 +405,14 @@ class EchoFiNetworkResilienceTest:
         )
         
         if success:
-            print(f"Health Status: {response.get('status', 'unknown')}")
-            print(f"Healthy Services: {response.get('services', {}).get('healthy', [])}") 
+            self._log(f"Health Status: {response.get('status', 'unknown')}")
+            self._log(f"Healthy Services: {response.get('services', {}).get('healthy', [])}") 
             
             # Verify response structure
-            required_fields = ['status', 'timestamp', 'services', 'features', 'performance']
-            missing_fields = [field for field in required_fields if field not in response]
+            missing_fields = HEALTH_REQUIRED.difference(response)
             
             if missing_fields:
-                print(f"❌ Health response missing required fields: {missing_fields}")
+                self._log(f"❌ Health response missing required fields: {sorted(missing_fields)}")
                 return False
                 
             return True
@@ -113,17 +429,16 @@ class EchoFiNetworkResilienceTest:
         
         if success:
             # Verify response structure
-            required_fields = ['timestamp', 'system', 'services', 'cache', 'network', 'summary']
-            missing_fields = [field for field in required_fields if field not in response]
+            missing_fields = METRICS_REQUIRED.difference(response)
             
             if missing_fields:
-                print(f"❌ Metrics response missing required fields: {missing_fields}")
+                self._log(f"❌ Metrics response missing required fields: {sorted(missing_fields)}")
                 return False
                 
-            print(f"Metrics Summary:")
+            self._log(f"Metrics Summary:")
             if 'summary' in response:
                 for key, value in response['summary'].items():
-                    print(f"- {key}: {value}")
+                    self._log(f"- {key}: {value}")
                 
             return True
         return False
@@ -138,15 +453,14 @@ class EchoFiNetworkResilienceTest:
         )
         
         if success:
-            print(f"Agent Status: {response.get('status', 'unknown')}")
-            print(f"Agent Message: {response.get('message', 'No message')}")
+            self._log(f"Agent Status: {response.get('status', 'unknown')}")
+            self._log(f"Agent Message: {response.get('message', 'No message')}")
             
             # Verify response structure
-            required_fields = ['status', 'message', 'services', 'features', 'timestamp']
-            missing_fields = [field for field in required_fields if field not in response]
+            missing_fields = AGENT_REQUIRED.difference(response)
             
             if missing_fields:
-                print(f"❌ Agent health response missing required fields: {missing_fields}")
+                self._log(f"❌ Agent health response missing required fields: {sorted(missing_fields)}")
                 return False
                 
             return True
@@ -163,13 +477,13 @@ class EchoFiNetworkResilienceTest:
         )
         
         if success:
-            print(f"Balance Request Success: {response.get('success', False)}")
+            self._log(f"Balance Request Success: {response.get('success', False)}")
             if response.get('success'):
                 balance_data = response.get('data', {})
-                print(f"Wallet Address: {balance_data.get('address', 'unknown')}")
-                print(f"Balance: {balance_data.get('balance', 'unknown')} {balance_data.get('currency', '')}")
+                self._log(f"Wallet Address: {balance_data.get('address', 'unknown')}")
+                self._log(f"Balance: {balance_data.get('balance', 'unknown')} {balance_data.get('currency', '')}")
             else:
-                print(f"Error: {response.get('error', 'Unknown error')}")
+                self._log(f"Error: {response.get('error', 'Unknown error')}")
                 
             return response.get('success', False)
         return False
@@ -185,16 +499,16 @@ class EchoFiNetworkResilienceTest:
         )
         
         if success:
-            print(f"Performance Analysis Success: {response.get('success', False)}")
+            self._log(f"Performance Analysis Success: {response.get('success', False)}")
             if response.get('success'):
                 # Just print the first few lines of the analysis
-                analysis = response.get('data', '').split('\n')
-                print("Analysis Summary:")
+                analysis = response.get('data', '').split('\n', 5)
+                self._log("Analysis Summary:")
                 for line in analysis[:5]:
-                    print(f"  {line}")
-                print("  ...")
+                    self._log(f"  {line}")
+                self._log("  ...")
             else:
-                print(f"Error: {response.get('error', 'Unknown error')}")
+                self._log(f"Error: {response.get('error', 'Unknown error')}")
                 
             return response.get('success', False)
         return False
@@ -210,11 +524,11 @@ class EchoFiNetworkResilienceTest:
         )
         
         if success:
-            print(f"User Groups Response: {type(response)}")
+            self._log(f"User Groups Response: {type(response)}")
             if isinstance(response, list):
-                print(f"Found {len(response)} user groups")
+                self._log(f"Found {len(response)} user groups")
             elif isinstance(response, dict) and 'error' in response:
-                print(f"Error: {response.get('error')}")
+                self._log(f"Error: {response.get('error')}")
                 return False
                 
             return True
@@ -222,33 +536,41 @@ class EchoFiNetworkResilienceTest:
 
     def test_circuit_breaker(self):
         """Test circuit breaker functionality by making repeated failing requests"""
-        print("\n🔄 Testing Circuit Breaker Functionality...")
-        print("Making repeated requests to trigger circuit breaker...")
+        self._log("\n🔄 Testing Circuit Breaker Functionality...")
+        self._log("Making repeated requests to trigger circuit breaker...")
+        self.clear_memo()
         
-        # Use a non-existent endpoint to trigger failures
-        for i in range(6):  # Should be enough to trigger circuit breaker
-            print(f"Request {i+1}/6...")
+        # Use a non-existent endpoint to trigger failures; the probes are independent,
+        # so fire them all at once rather than spacing them out
+        probe_url = self._api_base + "non-existent-endpoint"
+        probe_count = 6  # Should be enough to trigger circuit breaker
+        
+        def probe(i):
             try:
-                response = requests.get(f"{self.base_url}/api/non-existent-endpoint", timeout=2)
-                print(f"Status: {response.status_code}")
+                response = self.session.get(probe_url, timeout=2)
+                return f"Request {i+1}/{probe_count} - Status: {response.status_code}"
             except Exception as e:
-                print(f"Error: {str(e)}")
-            
-            time.sleep(1)
-        
-        # Now check if health endpoint reports any circuit breakers open
-        success, response = self.run_test(
-            "Health Check After Circuit Breaker Test",
-            "GET",
-            "health",
-            200
+                return f"Request {i+1}/{probe_count} - Error: {str(e)}"
+        
+        with ThreadPoolExecutor(max_workers=probe_count) as executor:
+            for outcome in executor.map(probe, range(probe_count)):
+                self._log(outcome)
+        
+        # Check whether health reports any circuit breakers open, then reset them, in one round-trip
+        (success, response), (reset_success, _) = self.run_batch(
+            "Circuit Breaker Check and Reset",
+            [
+                ("Health Check After Circuit Breaker Test", "GET", "health", 200, None),
+                ("Reset Circuit Breaker", "POST", "health", 200,
+                 {"action": "reset_circuit_breaker", "service": "all"}),
+            ]
         )
         
         if success:
             services = response.get('services', {})
             degraded_services = services.get('degraded', [])
             
-            print(f"Degraded Services: {degraded_services}")
+            self._log(f"Degraded Services: {degraded_services}")
             
             # Check network metrics for circuit breaker status
             network = response.get('network', {})
@@ -258,23 +580,14 @@ class EchoFiNetworkResilienceTest:
             for service_name, metrics in network.items():
                 if isinstance(metrics, dict) and metrics.get('circuitBreakerOpen', False):
                     circuit_breaker_open = True
-                    print(f"Circuit breaker open for {service_name}")
-            
-            # Reset circuit breaker
-            reset_success, reset_response = self.run_test(
-                "Reset Circuit Breaker",
-                "POST",
-                "health",
-                200,
-                data={"action": "reset_circuit_breaker", "service": "all"}
-            )
+                    self._log(f"Circuit breaker open for {service_name}")
             
             if reset_success:
-                print("Circuit breaker reset request sent")
+                self._log("Circuit breaker reset request sent")
             
             # For this test, we'll consider it successful if we got a valid health response
             # In a real test, you'd want to verify that circuit breakers actually opened
-            self.test_results.append({
+            self._record({
                 "name": "Circuit Breaker Test",
                 "success": True,
                 "notes": "Circuit breaker test completed, but actual circuit breaker state could not be definitively verified"
@@ -286,61 +599,42 @@ class EchoFiNetworkResilienceTest:
 
     def test_graceful_degradation(self):
         """Test graceful degradation by forcing a service into degraded mode"""
-        print("\n⚠️ Testing Graceful Degradation...")
-        
-        # First, enable degraded mode for a service
-        success, response = self.run_test(
-            "Enable Degraded Mode",
-            "POST",
-            "health",
-            200,
-            data={"action": "enable_degraded_mode", "service": "blockchain", "config": {"fallbackMode": "cache"}}
+        self._log("\n⚠️ Testing Graceful Degradation...")
+        self.clear_memo()
+        
+        # Enable degraded mode, exercise the agent, verify health and restore the service in one round-trip.
+        # Every action runs even if enabling degraded mode fails, so the disable step always restores the service.
+        (success, _), (balance_success, _), (health_success, health_response), (disable_success, _) = self.run_batch(
+            "Graceful Degradation",
+            [
+                ("Enable Degraded Mode", "POST", "health", 200,
+                 {"action": "enable_degraded_mode", "service": "blockchain", "config": {"fallbackMode": "cache"}}),
+                # Should still return 200 even in degraded mode
+                ("Get Balance in Degraded Mode", "POST", "agent", 200, {"action": "getBalance"}),
+                ("Health Check in Degraded Mode", "GET", "health", 200, None),
+                ("Disable Degraded Mode", "POST", "health", 200,
+                 {"action": "disable_degraded_mode", "service": "blockchain"}),
+            ]
         )
         
         if not success:
-            print("❌ Failed to enable degraded mode")
+            self._log("❌ Failed to enable degraded mode")
             return False
             
-        print("✅ Degraded mode enabled for blockchain service")
-        
-        # Now test agent functionality with degraded service
-        balance_success, balance_response = self.run_test(
-            "Get Balance in Degraded Mode",
-            "POST",
-            "agent",
-            200,  # Should still return 200 even in degraded mode
-            data={"action": "getBalance"}
-        )
-        
-        # Check health to verify degraded status
-        health_success, health_response = self.run_test(
-            "Health Check in Degraded Mode",
-            "GET",
-            "health",
-            200
-        )
+        self._log("✅ Degraded mode enabled for blockchain service")
         
         if health_success:
             degraded_services = health_response.get('services', {}).get('degraded', [])
-            print(f"Degraded Services: {degraded_services}")
+            self._log(f"Degraded Services: {degraded_services}")
             
             is_degraded = 'blockchain' in degraded_services
-            print(f"Blockchain Service Degraded: {is_degraded}")
-            
-            # Disable degraded mode
-            disable_success, disable_response = self.run_test(
-                "Disable Degraded Mode",
-                "POST",
-                "health",
-                200,
-                data={"action": "disable_degraded_mode", "service": "blockchain"}
-            )
+            self._log(f"Blockchain Service Degraded: {is_degraded}")
             
             if disable_success:
-                print("✅ Degraded mode disabled")
+                self._log("✅ Degraded mode disabled")
             
             # For this test, success means we could enable and verify degraded mode
-            self.test_results.append({
+            self._record({
                 "name": "Graceful Degradation Test",
                 "success": is_degraded,
                 "notes": "Verified service could be put in degraded mode and still function"
@@ -352,57 +646,60 @@ class EchoFiNetworkResilienceTest:
 
     def test_caching(self):
         """Test caching functionality"""
-        print("\n💾 Testing Caching Functionality...")
+        self._log("\n💾 Testing Caching Functionality...")
         
         # Make first request to potentially cache the response
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         first_success, first_response = self.run_test(
             "First Request (Uncached)",
             "GET",
             "health",
-            200
+            200,
+            memoize=False
         )
-        first_request_time = time.time() - start_time
+        first_request_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         if not first_success:
-            print("❌ Failed on first request")
+            self._log("❌ Failed on first request")
             return False
             
-        print(f"First request time: {first_request_time:.3f} seconds")
+        self._log(f"First request time: {first_request_time:.3f} seconds")
         
         # Make second request which might use cache
         time.sleep(1)  # Small delay
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         second_success, second_response = self.run_test(
             "Second Request (Potentially Cached)",
             "GET",
             "health",
-            200
+            200,
+            memoize=False
         )
-        second_request_time = time.time() - start_time
+        second_request_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         if not second_success:
-            print("❌ Failed on second request")
+            self._log("❌ Failed on second request")
             return False
             
-        print(f"Second request time: {second_request_time:.3f} seconds")
+        self._log(f"Second request time: {second_request_time:.3f} seconds")
         
         # Get cache stats
         cache_success, cache_response = self.run_test(
             "Cache Statistics",
             "GET",
             "metrics",
-            200
+            200,
+            memoize=False
         )
         
         if cache_success and 'cache' in cache_response:
             cache_stats = cache_response['cache']
-            print(f"Cache Hit Rate: {cache_stats.get('hitRate', 0)}%")
-            print(f"Cache Entries: {cache_stats.get('totalEntries', 0)}")
+            self._log(f"Cache Hit Rate: {cache_stats.get('hitRate', 0)}%")
+            self._log(f"Cache Entries: {cache_stats.get('totalEntries', 0)}")
             
             # For this test, we'll consider it successful if we got valid cache stats
             # In a real test, you'd want to verify actual caching behavior more thoroughly
-            self.test_results.append({
+            self._record({
                 "name": "Caching Test",
                 "success": True,
                 "notes": f"Cache hit rate: {cache_stats.get('hitRate', 0)}%, Entries: {cache_stats.get('totalEntries', 0)}"
@@ -414,33 +711,54 @@ class EchoFiNetworkResilienceTest:
 
     def run_all_tests(self):
         """Run all tests and report results"""
-        print("🚀 Starting EchoFi Network Resilience Tests")
-        print(f"Base URL: {self.base_url}")
-        print("=" * 80)
-        
-        start_time = time.time()
-        
-        # Basic API endpoint tests
-        self.test_health_endpoint()
-        self.test_metrics_endpoint()
-        self.test_agent_health()
-        self.test_agent_get_balance()
-        self.test_agent_analyze_performance()
-        self.test_user_groups()
-        
-        # Advanced resilience tests
-        self.test_circuit_breaker()
-        self.test_graceful_degradation()
-        self.test_caching()
-        
-        end_time = time.time()
-        test_duration = end_time - start_time
+        self._log("🚀 Starting EchoFi Network Resilience Tests")
+        self._log(f"Base URL: {self.base_url}")
+        self._log("=" * 80)
+        
+        start_ns = time.perf_counter_ns()
+        
+        # Build the lazily created session up front so the worker threads below share a single one
+        self.session
+        
+        with self._report_lock:
+            self._report_fp = open(RESULTS_FILE, "w", encoding="utf-8")
+        try:
+            # Basic API endpoint tests are independent, so they overlap their network waits on the shared session
+            independent_tests = (
+                self.test_health_endpoint,
+                self.test_metrics_endpoint,
+                self.test_agent_health,
+                self.test_agent_get_balance,
+                self.test_agent_analyze_performance,
+                self.test_user_groups,
+            )
+            self._replay_phase = True
+            try:
+                with ThreadPoolExecutor(max_workers=len(independent_tests)) as executor:
+                    futures = [executor.submit(self._run_buffered, test) for test in independent_tests]
+                    for future in futures:
+                        future.result()
+            finally:
+                self._replay_phase = False
+            
+            # Advanced resilience tests mutate server state, so they stay serial
+            self.test_circuit_breaker()
+            self.test_graceful_degradation()
+            self.test_caching()
+        finally:
+            # Flush and release the results file and connections even if a test raised
+            with self._report_lock:
+                self._report_fp.close()
+                self._report_fp = None
+            self.session.close()
+        
+        test_duration = (time.perf_counter_ns() - start_ns) / 1e9
         
         # Print summary
-        print("\n" + "=" * 80)
-        print(f"📊 Test Summary: {self.tests_passed}/{self.tests_run} tests passed")
-        print(f"⏱️ Total test duration: {test_duration:.2f} seconds")
-        print("=" * 80)
+        self._log("\n" + "=" * 80)
+        self._log(f"📊 Test Summary: {self.tests_passed}/{self.tests_run} tests passed")
+        self._log(f"⏱️ Total test duration: {test_duration:.2f} seconds")
+        self._log("=" * 80)
         
         # Generate detailed report
         self.generate_report()
@@ -457,16 +775,25 @@ class EchoFiNetworkResilienceTest:
                 "timestamp": datetime.now().isoformat(),
                 "base_url": self.base_url
             },
-            "test_results": self.test_results
+            "results_file": RESULTS_FILE
         }
         
-        # Save report to file
-        with open("network_resilience_test_report.json", "w") as f:
-            json.dump(report, f, indent=2)
+        # Save the summary header; per-test results were already streamed to RESULTS_FILE
+        if orjson is not None:
+            with open(REPORT_FILE, "wb") as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 if self.verbose else None))
+        else:
+            with open(REPORT_FILE, "w") as f:
+                if self.verbose:
+                    json.dump(report, f, indent=2)
+                else:
+                    json.dump(report, f, separators=(",", ":"))
             
-        print(f"📝 Detailed test report saved to network_resilience_test_report.json")
+        self._log(f"📝 Test summary saved to {REPORT_FILE}, detailed results in {RESULTS_FILE}")
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[logging.StreamHandler(sys.stdout)])
+    
     # Get base URL from environment or use default
     base_url = "http://localhost:3000"  # Default URL
     
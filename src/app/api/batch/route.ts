@@ -0,0 +1,148 @@
+// src/app/api/batch/route.ts
+// Batched action endpoint: runs several API actions in a single round-trip
+
+import { NextRequest, NextResponse } from 'next/server';
+import { GET as healthGET, POST as healthPOST } from '@/app/api/health/route';
+import { GET as agentGET, POST as agentPOST } from '@/app/api/agent/route';
+import { GET as metricsGET } from '@/app/api/metrics/route';
+
+type RouteHandler = (request: NextRequest) => Promise<Response>;
+type BatchMethod = 'GET' | 'POST';
+
+const BATCH_METHODS: ReadonlySet<string> = new Set<BatchMethod>(['GET', 'POST']);
+
+/**
+ * Routes that may be dispatched from a batch, keyed by endpoint and method.
+ * Maps keep lookups of client-supplied strings away from Object.prototype.
+ */
+const BATCH_HANDLERS: ReadonlyMap<string, ReadonlyMap<BatchMethod, RouteHandler>> = new Map([
+  ['health', new Map<BatchMethod, RouteHandler>([['GET', healthGET], ['POST', healthPOST]])],
+  ['agent', new Map<BatchMethod, RouteHandler>([['GET', agentGET], ['POST', agentPOST]])],
+  ['metrics', new Map<BatchMethod, RouteHandler>([['GET', metricsGET]])],
+]);
+
+const MAX_BATCH_SIZE = 20;
+
+/**
+ * Single entry in a batch request
+ */
+interface BatchAction {
+  endpoint: string;
+  method?: BatchMethod;
+  data?: unknown;
+}
+
+/**
+ * Result of a single batched action, mirroring the standalone HTTP response
+ */
+interface BatchResult {
+  endpoint: string;
+  status: number;
+  body: unknown;
+}
+
+/**
+ * Execute a list of actions sequentially and return every result at once
+ * POST /api/batch
+ * Body: { "batch": [{ "endpoint": "health", "method": "POST", "data": { ... } }, ...] }
+ */
+export async function POST(request: NextRequest) {
+  try {
+    const body = await request.json();
+    const { batch } = body;
+
+    if (!Array.isArray(batch) || batch.length === 0) {
+      return NextResponse.json({
+        success: false,
+        error: '"batch" must be a non-empty array of actions'
+      }, { status: 400 });
+    }
+
+    if (batch.length > MAX_BATCH_SIZE) {
+      return NextResponse.json({
+        success: false,
+        error: `Batch size ${batch.length} exceeds maximum of ${MAX_BATCH_SIZE}`
+      }, { status: 400 });
+    }
+
+    console.log(`📦 [BATCH] Executing ${batch.length} actions`);
+
+    // Actions run in order so later entries observe state changed by earlier ones
+    const results: BatchResult[] = [];
+    for (const action of batch as BatchAction[]) {
+      results.push(await executeAction(action, request));
+    }
+
+    return NextResponse.json({
+      success: true,
+      results
+    });
+
+  } catch (error) {
+    console.error('❌ [BATCH] Batch execution failed:', error);
+
+    return NextResponse.json({
+      success: false,
+      error: error instanceof Error ? error.message : String(error)
+    }, { status: 500 });
+  }
+}
+
+/**
+ * Dispatch a single batched action to its route handler in-process
+ */
+async function executeAction(action: BatchAction, request: NextRequest): Promise<BatchResult> {
+  const endpoint = action?.endpoint;
+  const method: unknown = action?.method ?? (action?.data === undefined ? 'GET' : 'POST');
+
+  if (typeof method !== 'string' || !BATCH_METHODS.has(method)) {
+    return {
+      endpoint,
+      status: 400,
+      body: { success: false, error: `Unsupported batch method: ${String(method)}` }
+    };
+  }
+
+  const handler = typeof endpoint === 'string'
+    ? BATCH_HANDLERS.get(endpoint)?.get(method as BatchMethod)
+    : undefined;
+
+  if (!handler) {
+    return {
+      endpoint,
+      status: 404,
+      body: { success: false, error: `Unsupported batch action: ${method} /api/${endpoint}` }
+    };
+  }
+
+  try {
+    const actionRequest = new NextRequest(new URL(`/api/${endpoint}`, request.url), {
+      method,
+      headers: { 'Content-Type': 'application/json' },
+      ...(method === 'POST' && { body: JSON.stringify(action.data ?? {}) }),
+    });
+
+    const response = await handler(actionRequest);
+    const text = await response.text();
+
+    let responseBody: unknown = text;
+    try {
+      responseBody = JSON.parse(text);
+    } catch {
+      // Non-JSON bodies (e.g. Prometheus metrics) are passed through as text
+    }
+
+    return {
+      endpoint,
+      status: response.status,
+      body: responseBody
+    };
+
+  } catch (error) {
+    return {
+      endpoint,
+      status: 500,
+      body: { success: false, error: error instanceof Error ? error.message : String(error) }
+    };
+  }
+}